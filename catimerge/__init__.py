@@ -7,7 +7,8 @@ r"""
 Merge two catima.zip exports.
 
 $ catimerge --help
-usage: catimerge [-h] [-v] [--version] FIRST_ZIP SECOND_ZIP OUTPUT_ZIP
+usage: catimerge [-h] [-v] [--fast] [--version]
+                 FIRST_ZIP SECOND_ZIP OUTPUT_ZIP
 
 positional arguments:
   FIRST_ZIP
@@ -17,6 +18,7 @@ positional arguments:
 options:
   -h, --help     show this help message and exit
   -v, --verbose
+  --fast
   --version      show program's version number and exit
 $ catimerge -v catima1.zip catima2.zip out.zip
 Merging 'catima1.zip' and 'catima2.zip' into 'out.zip'...
@@ -29,17 +31,34 @@ Output has   3 group(s),  14 card(s),   5 card group(s),   8 image file(s)
 Writing...
 """
 
+import concurrent.futures
+import contextlib
 import csv
+import functools
 import io
+import operator
+import os
 import re
+import shutil
+import stat
+import sys
+import time
 import zipfile
 
 from dataclasses import dataclass, field, fields
-from typing import Dict, List, Optional, TextIO, Tuple
+from typing import Callable, Dict, IO, Iterable, List, Optional, TextIO, Tuple
 
 __version__ = "0.1.1"
+COPY_BUFSIZE = 64 * 1024
+LOCAL_HEADER_MAGIC = b"PK\x03\x04"
+LOCAL_HEADER_SIZE = 30
+MAX_COPY_WORKERS = 16
+USE_SENDFILE = sys.platform.startswith("linux") and hasattr(os, "sendfile")
+LEADING_ID_REGEX_V2 = re.compile(rb"^(\d+),", re.MULTILINE)
 IMAGE_REGEX_V2 = re.compile(r"(card_)(\d+)(_(?:front|back|icon)\.png)")
 
+_CopyJob = Tuple[zipfile.ZipFile, int, int, int]
+
 
 class Error(Exception):
     """Base class for errors."""
@@ -70,12 +89,17 @@ class ExportV2(Export):
 
 
 def catimerge(first_zip: str, second_zip: str, output_zip: str, *,
-              verbose: bool = False) -> None:
+              verbose: bool = False, fast: bool = False) -> None:
     """Merge two catima .zip exports."""
     if verbose:
         print(f"Merging {first_zip!r} and {second_zip!r} into {output_zip!r}...")
     with zipfile.ZipFile(first_zip) as zf1:
         with zipfile.ZipFile(second_zip) as zf2:
+            if fast:
+                if merge_v2_fast(zf1, zf2, output_zip, verbose=verbose):
+                    return
+                if verbose:
+                    print("Fast path not applicable.")
             if verbose:
                 print("Parsing...")
             merge(parse(zf1), parse(zf2), zf1, zf2, output_zip, verbose=verbose)
@@ -119,6 +143,8 @@ def merge_v2(e1: ExportV2, e2: ExportV2, zf1: zipfile.ZipFile, zf2: zipfile.ZipF
     ...     zfo = zipfile.ZipFile(out)
     ...     for info in zfo.infolist():
     ...         print(f"{info.CRC:08x} {info.filename}")
+    ...     zfo.testzip()
+    ...     expected = [(i.filename, i.CRC) for i in zfo.infolist()]
     ...     r = parse(zfo)
     ...     r.groups_keys
     ...     r.cards_keys
@@ -152,6 +178,34 @@ def merge_v2(e1: ExportV2, e2: ExportV2, zf1: zipfile.ZipFile, zf2: zipfile.ZipF
     [['2', '"two\''], ['3', '"two\''], ['1', 'one'], ['5', 'one'], ['5', 'three']]
     ['card_2_icon.png', 'card_1_front.png', 'card_1_icon.png', 'card_5_icon.png', 'card_6_front.png']
 
+    Inputs w/o a file name (serial copy), and outputs that are not regular
+    files or can't seek at all (written by zipfile itself):
+
+    >>> def check(zfo):
+    ...     return [(i.filename, i.CRC) for i in zfo.infolist()] == expected \
+    ...         and zfo.testzip() is None
+    >>> with open("test/catima1.zip", "rb") as fh1, open("test/catima2.zip", "rb") as fh2:
+    ...     zb1 = zipfile.ZipFile(io.BytesIO(fh1.read()))
+    ...     zb2 = zipfile.ZipFile(io.BytesIO(fh2.read()))
+    >>> with tempfile.TemporaryDirectory() as tmpdir:
+    ...     out = os.path.join(tmpdir, "out.zip")
+    ...     merge(e1, e2, zb1, zb2, out)
+    ...     check(zipfile.ZipFile(out))
+    True
+    >>> buf = io.BytesIO()
+    >>> merge(e1, e2, zf1, zf2, buf)
+    >>> check(zipfile.ZipFile(buf))
+    True
+    >>> class Pipe:
+    ...     def __init__(self): self.data = b""
+    ...     def write(self, b): self.data += b; return len(b)
+    ...     def flush(self): pass
+    >>> pipe = Pipe()
+    >>> merge(e1, e2, zf1, zf2, pipe)
+    >>> check(zipfile.ZipFile(io.BytesIO(pipe.data)))
+    True
+    >>> merge(e1, e2, zf1, zf2, os.devnull)
+
     """
     if verbose:
         print("Version: 2")
@@ -164,62 +218,235 @@ def merge_v2(e1: ExportV2, e2: ExportV2, zf1: zipfile.ZipFile, zf2: zipfile.ZipF
               f"{len(e2.card_groups):3d} card group(s), "
               f"{len(e2.image_files):3d} image file(s)")
         print("Merging...")
-    image_map: Dict[str, Tuple[zipfile.ZipFile, str]] = {}
     e_out = ExportV2()
     for f in fields(ExportV2):
         if f.name.endswith("_keys"):
             if getattr(e1, f.name) != getattr(e2, f.name):
                 raise Error(f"Mismatched {f.name}")
             setattr(e_out, f.name, getattr(e1, f.name))
-    e_out.groups = [[g] for g in sorted(set(g[0] for g in e1.groups + e2.groups))]
-    e1_max_id = _merge_cards_v2(e1, e2, e_out)
-    _merge_card_groups_v2(e1, e2, e_out, e1_max_id)
-    for filename in e1.image_files:
-        image_map[filename] = (zf1, filename)
-    for filename in e2.image_files:
-        new_filename = _rename_file_v2(filename, e1_max_id)
-        image_map[new_filename] = (zf2, filename)
-    csv_data = unparse_v2(e_out)
+    group_ids = set(map(operator.itemgetter(0), e1.groups))
+    group_ids.update(map(operator.itemgetter(0), e2.groups))
+    e_out.groups = [[g] for g in sorted(group_ids)]
+    cards_id_idx = e_out.cards_keys.index("_id")
+    card_groups_cardid_idx = e_out.card_groups_keys.index("cardId")
+    e1_max_id = _merge_cards_v2(e1, e2, e_out, cards_id_idx)
+    _merge_card_groups_v2(e1, e2, e_out, e1_max_id, card_groups_cardid_idx)
+    image_map1, image_map2 = _image_maps_v2(e1.image_files, e2.image_files, e1_max_id)
     if verbose:
         print(f"Output has {len(e_out.groups):3d} group(s), "
               f"{len(e_out.cards):3d} card(s), "
               f"{len(e_out.card_groups):3d} card group(s), "
-              f"{len(image_map):3d} image file(s)")
+              f"{len(image_map1) + len(image_map2):3d} image file(s)")
         print("Writing...")
-    with zipfile.ZipFile(output_zip, "w") as zf_out:
-        zf_out.writestr("catima.csv", csv_data)
-        for name, (zf, old_name) in image_map.items():
-            zf_out.writestr(name, zf.read(old_name))
-
-
-def _merge_cards_v2(e1: ExportV2, e2: ExportV2, e_out: ExportV2) -> int:
-    e1_max_id = 0
-    cards_id_idx = e1.cards_keys.index("_id")
-    for card in e1.cards:
-        card_id = int(card[cards_id_idx])
-        if card_id < 1:
-            raise Error("ID < 1")
-        e1_max_id = max(e1_max_id, card_id)
-        e_out.cards.append(card)
-    for card in e2.cards:
-        card_id = int(card[cards_id_idx])
-        if card_id < 1:
-            raise Error("ID < 1")
+    with zipfile.ZipFile(output_zip, "w", compression=zipfile.ZIP_DEFLATED) as zf_out:
+        with zf_out.open(_csv_info(zf_out), "w") as raw:
+            with io.TextIOWrapper(raw, encoding="utf-8", newline="") as fh:
+                unparse_v2_stream(e_out, fh)
+        _copy_images(zf_out, output_zip, [(zf1, image_map1), (zf2, image_map2)])
+
+
+def _image_maps_v2(e1_image_files: List[str], e2_image_files: List[str],
+                   e1_max_id: int) -> Tuple[Dict[str, str], Dict[str, str]]:
+    # NB: identical images are not deduplicated: Catima finds a card's images
+    # by name (card_<ID>_<side>.png), so each card needs its own entry, and
+    # entries sharing data would break sequential (local header) readers.
+
+    # output name -> original name, one map per input; images are written
+    # (and thus end up in the central directory) in this order
+    image_map1 = {filename: filename for filename in e1_image_files}
+    image_map2 = {_rename_file_v2(filename, e1_max_id): filename
+                  for filename in e2_image_files}
+    if not image_map1.keys().isdisjoint(image_map2):
+        raise Error("Duplicate image file name")
+    return image_map1, image_map2
+
+
+def _csv_info(zf_out: zipfile.ZipFile) -> zipfile.ZipInfo:
+    info = zipfile.ZipInfo("catima.csv", time.localtime()[:6])
+    info.compress_type = zf_out.compression
+    info.external_attr = 0o600 << 16
+    return info
+
+
+def _copy_images(zf_out: zipfile.ZipFile, output_zip: str,
+                 image_maps: List[Tuple[zipfile.ZipFile, Dict[str, str]]]) -> None:
+    # copy the compressed data as-is: no decompression, stored CRC is reused;
+    # entries are laid out and their local headers written serially (in
+    # order), the data is then copied (in parallel when the files can be
+    # reopened); ZipFile.close() writes the central directory as usual
+    assert zf_out.fp is not None
+    entries = []
+    for zf, image_map in image_maps:
+        assert zf.fp is not None
+        for name, old_name in image_map.items():
+            info = zf.getinfo(old_name)
+            # read all source offsets before writing anything, so a bad input
+            # can't leave a half-written (unreadable) output
+            entries.append((zf, info, _renamed_info(info, name), _data_offset(zf.fp, info)))
+    if not getattr(zf_out, "_seekable", True) or not _is_regular_file(zf_out.fp):
+        # can't seek (e.g. a pipe), or tell() may not track what was written
+        # (e.g. /dev/null): let zipfile write the entries itself
+        for zf, info, new_info, _ in entries:
+            with zf.open(info) as src, zf_out.open(new_info, "w") as dst:
+                shutil.copyfileobj(src, dst, COPY_BUFSIZE)
+        # resync w/ the device: a buffered tell() can run ahead of e.g.
+        # /dev/null's position, making close() compute a negative size
+        zf_out.fp.flush()
+        zf_out.start_dir = zf_out.fp.tell()
+        return
+    jobs: List[_CopyJob] = []
+    offset = zf_out.start_dir
+    for zf, info, new_info, src_offset in entries:
+        new_info.header_offset = offset
+        header = new_info.FileHeader()
+        zf_out.fp.seek(offset)
+        zf_out.fp.write(header)
+        offset += len(header)
+        jobs.append((zf, src_offset, info.compress_size, offset))
+        offset += info.compress_size
+        zf_out.filelist.append(new_info)
+        zf_out.NameToInfo[new_info.filename] = new_info
+    # the central directory goes after the data even if copying fails
+    zf_out.fp.seek(offset)
+    zf_out.start_dir = offset
+    if jobs and all(zf.filename for zf, *_ in jobs) and \
+            isinstance(output_zip, (str, os.PathLike)) and os.path.isfile(output_zip):
+        zf_out.fp.flush()
+        workers = min(MAX_COPY_WORKERS, len(jobs))
+        with concurrent.futures.ThreadPoolExecutor(workers) as executor:
+            chunks = [jobs[i::workers] for i in range(workers)]
+            for _ in executor.map(functools.partial(_copy_jobs_reopen, output_zip), chunks):
+                pass
+    else:
+        # can't reopen input(s) or output: copy serially using the shared fps
+        _copy_jobs(jobs, zf_out.fp, _zip_fp)
+        zf_out.fp.seek(offset)
+
+
+def _is_regular_file(fp: IO[bytes]) -> bool:
+    try:
+        return stat.S_ISREG(os.fstat(fp.fileno()).st_mode)
+    except (AttributeError, OSError):
+        return False
+
+
+def _copy_jobs_reopen(output_zip: str, jobs: List[_CopyJob]) -> None:
+    # ZipFile is not thread-safe: use separate file handles per worker
+    with contextlib.ExitStack() as stack:
+        dst = stack.enter_context(open(output_zip, "r+b"))
+        srcs: Dict[str, IO[bytes]] = {}
+
+        def src_fp(zf: zipfile.ZipFile) -> IO[bytes]:
+            assert zf.filename is not None
+            if zf.filename not in srcs:
+                srcs[zf.filename] = stack.enter_context(open(zf.filename, "rb"))
+            return srcs[zf.filename]
+
+        _copy_jobs(jobs, dst, src_fp)
+
+
+def _copy_jobs(jobs: List[_CopyJob], dst: IO[bytes],
+               src_fp: Callable[[zipfile.ZipFile], IO[bytes]]) -> None:
+    buf = memoryview(bytearray(COPY_BUFSIZE))   # reused for all jobs
+    for zf, src_offset, size, dst_offset in jobs:
+        dst.seek(dst_offset)
+        _copy_data(src_fp(zf), src_offset, size, dst, buf)
+
+
+def _zip_fp(zf: zipfile.ZipFile) -> IO[bytes]:
+    assert zf.fp is not None
+    return zf.fp
+
+
+def _renamed_info(info: zipfile.ZipInfo, name: str) -> zipfile.ZipInfo:
+    new_info = zipfile.ZipInfo(name, info.date_time)
+    new_info.compress_type = info.compress_type
+    new_info.create_system = info.create_system
+    new_info.external_attr = info.external_attr
+    new_info.CRC = info.CRC
+    new_info.compress_size = info.compress_size
+    new_info.file_size = info.file_size
+    return new_info
+
+
+def _data_offset(fp: IO[bytes], info: zipfile.ZipInfo) -> int:
+    fp.seek(info.header_offset)
+    header = fp.read(LOCAL_HEADER_SIZE)
+    if len(header) != LOCAL_HEADER_SIZE or header[:4] != LOCAL_HEADER_MAGIC:
+        raise zipfile.BadZipFile(f"Bad local file header for {info.filename!r}")
+    name_len = int.from_bytes(header[26:28], "little")
+    extra_len = int.from_bytes(header[28:30], "little")
+    return info.header_offset + LOCAL_HEADER_SIZE + name_len + extra_len
+
+
+def _copy_data(src: IO[bytes], offset: int, size: int, dst: IO[bytes],
+               buf: memoryview) -> None:
+    if size and USE_SENDFILE and _sendfile(src, offset, size, dst):
+        return
+    src.seek(offset)
+    while size:
+        n = src.readinto(buf[:min(size, len(buf))])  # type: ignore[attr-defined]
+        if not n:
+            raise zipfile.BadZipFile("Truncated file data")
+        dst.write(buf[:n])
+        size -= n
+
+
+def _sendfile(src: IO[bytes], offset: int, size: int, dst: IO[bytes]) -> bool:
+    # copy in-kernel; returns False if not possible (e.g. not a real file)
+    try:
+        src_fd, dst_fd = src.fileno(), dst.fileno()
+    except (AttributeError, io.UnsupportedOperation):
+        return False
+    dst.flush()
+    pos = dst.tell()
+    copied = 0
+    while copied < size:
+        try:
+            n = os.sendfile(dst_fd, src_fd, offset + copied, size - copied)
+        except OSError:
+            if copied:
+                raise
+            return False
+        if not n:
+            raise zipfile.BadZipFile("Truncated file data")
+        copied += n
+    dst.seek(pos + size)    # sync the buffered file's position
+    return True
+
+
+def _merge_cards_v2(e1: ExportV2, e2: ExportV2, e_out: ExportV2,
+                    cards_id_idx: int) -> int:
+    e1_max_id = max(_card_ids(e1.cards, cards_id_idx), default=0)
+    cards = e_out.cards
+    cards.extend(e1.cards)
+    for card, card_id in zip(e2.cards, _card_ids(e2.cards, cards_id_idx)):
         new_card = card[:]
         new_card[cards_id_idx] = str(card_id + e1_max_id)
-        e_out.cards.append(new_card)
+        cards.append(new_card)
     return e1_max_id
 
 
+def _card_ids(cards: List[List[str]], idx: int) -> List[int]:
+    ids = _int_column(cards, idx)
+    if ids and min(ids) < 1:
+        raise Error("ID < 1")
+    return ids
+
+
+def _int_column(rows: List[List[str]], idx: int) -> List[int]:
+    return list(map(int, map(operator.itemgetter(idx), rows)))
+
+
 def _merge_card_groups_v2(e1: ExportV2, e2: ExportV2, e_out: ExportV2,
-                          e1_max_id: int) -> None:
-    e_out.card_groups = e1.card_groups[:]
-    card_groups_cardid_idx = e1.card_groups_keys.index("cardId")
-    for card_group in e2.card_groups:
-        card_id = int(card_group[card_groups_cardid_idx])
+                          e1_max_id: int, card_groups_cardid_idx: int) -> None:
+    card_groups = e_out.card_groups
+    card_groups.extend(e1.card_groups)
+    card_ids = _int_column(e2.card_groups, card_groups_cardid_idx)
+    for card_group, card_id in zip(e2.card_groups, card_ids):
         new_card_group = card_group[:]
         new_card_group[card_groups_cardid_idx] = str(card_id + e1_max_id)
-        e_out.card_groups.append(new_card_group)
+        card_groups.append(new_card_group)
 
 
 def _rename_file_v2(filename: str, e1_max_id: int) -> str:
@@ -229,19 +456,162 @@ def _rename_file_v2(filename: str, e1_max_id: int) -> str:
     raise Error(f"Unexpected file name format in import: {filename!r}")
 
 
+def merge_v2_fast(zf1: zipfile.ZipFile, zf2: zipfile.ZipFile, output_zip: str, *,
+                  verbose: bool = False) -> bool:
+    r"""
+    Merge two V2 exports w/o parsing the CSV.
+
+    Only applicable to well-formed exports w/o any quoted fields (and with _id
+    and cardId as the first columns); the CSV sections are merged as bytes and
+    IDs are re-indexed using a regex.  Returns False (w/o writing anything) if
+    the fast path is not applicable.
+
+    >>> import os, tempfile
+    >>> zf1 = zipfile.ZipFile("test/catima1.zip")
+    >>> zf2 = zipfile.ZipFile("test/catima2.zip")
+    >>> with tempfile.TemporaryDirectory() as tmpdir:
+    ...     merge_v2_fast(zf1, zf2, os.path.join(tmpdir, "out.zip"))
+    False
+
+    >>> def strip_quotes(zf, out):
+    ...     with zipfile.ZipFile(out, "w") as zf_out:
+    ...         for info in zf.infolist():
+    ...             data = zf.read(info)
+    ...             if info.filename == "catima.csv":
+    ...                 e = parse(zf)
+    ...                 assert isinstance(e, ExportV2)
+    ...                 for rows in (e.groups, e.cards, e.card_groups):
+    ...                     for row in rows:
+    ...                         row[:] = [re.sub(r'["\n]', "", x) for x in row]
+    ...                 data = unparse_v2(e)
+    ...             zf_out.writestr(info, data)
+    ...     return zipfile.ZipFile(out)
+    >>> with tempfile.TemporaryDirectory() as tmpdir:
+    ...     zf1 = strip_quotes(zf1, os.path.join(tmpdir, "1.zip"))
+    ...     zf2 = strip_quotes(zf2, os.path.join(tmpdir, "2.zip"))
+    ...     out1, out2 = os.path.join(tmpdir, "out1.zip"), os.path.join(tmpdir, "out2.zip")
+    ...     merge_v2_fast(zf1, zf2, out1, verbose=True)
+    ...     merge(parse(zf1), parse(zf2), zf1, zf2, out2)
+    ...     zfo1, zfo2 = zipfile.ZipFile(out1), zipfile.ZipFile(out2)
+    ...     zfo1.read("catima.csv") == zfo2.read("catima.csv")
+    ...     [(i.filename, i.CRC) for i in zfo1.infolist()] == \
+    ...         [(i.filename, i.CRC) for i in zfo2.infolist()]
+    ...     zfo1.testzip()
+    Version: 2 (fast)
+    Merging...
+    Writing...
+    True
+    True
+    True
+
+    >>> with tempfile.TemporaryDirectory() as tmpdir:
+    ...     zf1 = strip_quotes(zipfile.ZipFile("test/catima1.zip"), os.path.join(tmpdir, "1.zip"))
+    ...     zf2 = strip_quotes(zipfile.ZipFile("test/catima2.zip"), os.path.join(tmpdir, "2.zip"))
+    ...     with zipfile.ZipFile(os.path.join(tmpdir, "bad.zip"), "w") as zf_bad:
+    ...         for info in zf2.infolist():
+    ...             data = zf2.read(info)
+    ...             if info.filename == "catima.csv":
+    ...                 data = data[:-2] + b"\xff\r\n"
+    ...             zf_bad.writestr(info, data)
+    ...     merge_v2_fast(zf1, zipfile.ZipFile(zf_bad.filename), os.path.join(tmpdir, "out.zip"))
+    False
+
+    """
+    raw1, raw2 = _raw_export_v2(zf1), _raw_export_v2(zf2)
+    if raw1 is None or raw2 is None:
+        return False
+    (groups1, cards1, card_groups1), e1_image_files = raw1
+    (groups2, cards2, card_groups2), e2_image_files = raw2
+    if (groups1[0], cards1[0], card_groups1[0]) != (groups2[0], cards2[0], card_groups2[0]):
+        return False
+    if not (cards1[0].startswith(b"_id,") and card_groups1[0].startswith(b"cardId,")):
+        return False
+    ids1 = list(map(int, LEADING_ID_REGEX_V2.findall(cards1[1])))
+    ids2 = list(map(int, LEADING_ID_REGEX_V2.findall(cards2[1])))
+    if len(ids1) != _count_rows(cards1[1]) or len(ids2) != _count_rows(cards2[1]):
+        return False
+    if min(min(ids1, default=1), min(ids2, default=1)) < 1:
+        return False
+    for rows in (card_groups1[1], card_groups2[1]):
+        if len(LEADING_ID_REGEX_V2.findall(rows)) != _count_rows(rows):
+            return False
+    if verbose:
+        print("Version: 2 (fast)")
+        print("Merging...")
+    e1_max_id = max(ids1, default=0)
+
+    def reindex(rows: bytes) -> bytes:
+        return LEADING_ID_REGEX_V2.sub(lambda m: b"%d," % (int(m[1]) + e1_max_id), rows)
+
+    group_ids = set(groups1[1].split(b"\r\n"))
+    group_ids.update(groups2[1].split(b"\r\n"))
+    group_ids.discard(b"")
+    groups = b"\r\n".join(sorted(group_ids))
+    sections = [(groups1[0], groups),
+                (cards1[0], _join_rows(cards1[1], reindex(cards2[1]))),
+                (card_groups1[0], _join_rows(card_groups1[1], reindex(card_groups2[1])))]
+    csv_data = b"2\r\n\r\n" + b"\r\n\r\n".join(_join_rows(k, r) for k, r in sections) + b"\r\n"
+    image_map1, image_map2 = _image_maps_v2(e1_image_files, e2_image_files, e1_max_id)
+    if verbose:
+        print("Writing...")
+    with zipfile.ZipFile(output_zip, "w", compression=zipfile.ZIP_DEFLATED) as zf_out:
+        zf_out.writestr(_csv_info(zf_out), csv_data)
+        _copy_images(zf_out, output_zip, [(zf1, image_map1), (zf2, image_map2)])
+    return True
+
+
+def _raw_export_v2(zf: zipfile.ZipFile) -> Optional[Tuple[List[Tuple[bytes, bytes]], List[str]]]:
+    # (header, rows) per section + image files; None if not fast path material
+    image_files = []
+    data = None
+    for info in zf.infolist():
+        if info.filename == "catima.csv":
+            data = zf.read(info)
+        elif info.filename.endswith(".png"):
+            image_files.append(info.filename)
+        else:
+            return None
+    if data is None or not data.startswith(b"2\r\n\r\n") or not data.endswith(b"\r\n"):
+        return None
+    if b'"' in data or not data.count(b"\r") == data.count(b"\n") == data.count(b"\r\n"):
+        return None
+    try:
+        data.decode()
+    except UnicodeDecodeError:
+        return None
+    sections = []
+    for section in data[5:-2].split(b"\r\n\r\n"):
+        header, _, rows = section.partition(b"\r\n")
+        n = header.count(b",")
+        if rows and not all(row.count(b",") == n for row in rows.split(b"\r\n")):
+            return None
+        sections.append((header, rows))
+    if len(sections) != 3:
+        return None
+    return sections, image_files
+
+
+def _count_rows(rows: bytes) -> int:
+    return rows.count(b"\r\n") + 1 if rows else 0
+
+
+def _join_rows(a: bytes, b: bytes) -> bytes:
+    return a + b"\r\n" + b if a and b else a or b
+
+
 def parse(zf: zipfile.ZipFile) -> Export:
     """Parse catima.csv and list PNGs."""
     export = None
     image_files = []
     for info in zf.infolist():
         if info.filename == "catima.csv":
-            fh = io.StringIO(zf.read(info).decode())
-            version = fh.readline().strip()
-            fh.readline()
-            if version == "2":
-                export = parse_v2(fh)
-            else:
-                raise Error(f"Unexpected version in import: {version}")
+            with io.TextIOWrapper(zf.open(info), encoding="utf-8", newline="") as fh:
+                version = fh.readline().strip()
+                fh.readline()
+                if version == "2":
+                    export = parse_v2(fh)
+                else:
+                    raise Error(f"Unexpected version in import: {version}")
         elif info.filename.endswith(".png"):
             image_files.append(info.filename)
         else:
@@ -295,13 +665,17 @@ def parse_v2(fh: TextIO) -> ExportV2:
     >>> r.image_files
     ['card_1_icon.png', 'card_2_front.png']
 
+    >>> r = parse_v2(io.StringIO("_id\r\none\r\n\r\n_id,store\r\n1,foo\r\n2,\r\n"
+    ...                          "\r\ncardId,groupId\r\n1,one\r\n"))
+    >>> r.groups, r.cards, r.card_groups
+    ([['one']], [['1', 'foo'], ['2', '']], [['1', 'one']])
+
     """
     export = ExportV2()
     header = None
     keys = [export.groups_keys, export.cards_keys, export.card_groups_keys]
     records = [export.groups, export.cards, export.card_groups]
-    reader = csv.reader(fh)
-    for row in reader:
+    for row in _read_rows(fh):
         if header is None:
             header = row
             keys[0].extend(header)
@@ -320,22 +694,41 @@ def parse_v2(fh: TextIO) -> ExportV2:
     return export
 
 
-def unparse_v2(export: ExportV2) -> str:
+def _read_rows(fh: TextIO) -> Iterable[List[str]]:
+    data = fh.read()
+    if '"' not in data and data.count("\r") == data.count("\n") == data.count("\r\n"):
+        # shortcut: no quoted fields (and no bare CR/LF) at all, split the
+        # whole buffer directly
+        lines = data.split("\r\n")
+        if not lines[-1]:
+            lines.pop()
+        return [line.split(",") if line else [] for line in lines]
+    return csv.reader(io.StringIO(data))
+
+
+def unparse_v2(export: ExportV2) -> bytes:
     r"""
-    Turn V2 export into a catima.csv (str).
+    Turn V2 export into a catima.csv (bytes).
 
     >>> zf = zipfile.ZipFile("test/catima1.zip")
-    >>> s = unparse_v2(parse(zf)).encode()
+    >>> s = unparse_v2(parse(zf))
     >>> s == zf.read("catima.csv")
     True
 
     >>> zf = zipfile.ZipFile("test/catima2.zip")
-    >>> s = unparse_v2(parse(zf)).encode()
+    >>> s = unparse_v2(parse(zf))
     >>> s == zf.read("catima.csv")
     True
 
     """
-    fh = io.StringIO(newline="")
+    buf = io.BytesIO()
+    with io.TextIOWrapper(buf, encoding="utf-8", newline="", write_through=True) as fh:
+        unparse_v2_stream(export, fh)
+        return buf.getvalue()
+
+
+def unparse_v2_stream(export: ExportV2, fh: TextIO) -> None:
+    """Write V2 export as catima.csv to fh (opened w/ newline="")."""
     fh.write("2\r\n")
     keys = [export.groups_keys, export.cards_keys, export.card_groups_keys]
     records = [export.groups, export.cards, export.card_groups]
@@ -343,22 +736,21 @@ def unparse_v2(export: ExportV2) -> str:
         fh.write("\r\n")
         writer = csv.writer(fh, lineterminator="\r\n")
         writer.writerow(ks)
-        for r in rs:
-            writer.writerow(r)
-    return fh.getvalue()
+        writer.writerows(rs)
 
 
 def main() -> None:
     import argparse
     parser = argparse.ArgumentParser(prog="catimerge")
     parser.add_argument("-v", "--verbose", action="store_true")
+    parser.add_argument("--fast", action="store_true")
     parser.add_argument("--version", action="version", version=f"%(prog)s {__version__}")
     parser.add_argument("first_zip", metavar="FIRST_ZIP")
     parser.add_argument("second_zip", metavar="SECOND_ZIP")
     parser.add_argument("output_zip", metavar="OUTPUT_ZIP")
     args = parser.parse_args()
     catimerge(args.first_zip, args.second_zip, args.output_zip,
-              verbose=args.verbose)
+              verbose=args.verbose, fast=args.fast)
 
 
 def gui() -> None: